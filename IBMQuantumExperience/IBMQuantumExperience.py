@@ -4,8 +4,18 @@
 import json
 import datetime
 import time
+import threading
+import warnings
+import zlib
+from string import Template
+from multiprocessing.pool import ThreadPool
 import requests
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class _Credentials(object):
 
@@ -58,6 +68,17 @@ class _Request(object):
 
     def __init__(self, token, config=None):
         self.credential = _Credentials(token, config)
+        self.gzip_threshold = self.credential.config.get('gzip_threshold',
+                                                         None)
+        self.bandwidth = self.credential.config.get('bandwidth', None)
+        self.statistics = {
+            'requests': 0,
+            'bytesSent': 0,
+            'bytesReceived': 0,
+            'bytesSaved': 0,
+            'timeSaved': 0.0
+        }
+        self._lock = threading.Lock()
 
     def check_token(self, respond):
         '''
@@ -68,6 +89,71 @@ class _Request(object):
             return False
         return True
 
+    def _compress(self, data, headers):
+        '''
+        Compress with gzip the body of a request, if it is bigger than the
+        gzip_threshold of the config
+        '''
+        headers.pop('Content-Encoding', None)
+        if data is None or isinstance(data, dict):
+            return data, 0, 0.0
+        if not isinstance(data, bytes):
+            data = data.encode('utf-8')
+        if self.gzip_threshold is None or len(data) < self.gzip_threshold:
+            return data, 0, 0.0
+        start = time.time()
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+        compress_time = time.time() - start
+        if len(compressed) >= len(data):
+            return data, 0, compress_time
+        headers['Content-Encoding'] = 'gzip'
+        return compressed, len(data) - len(compressed), compress_time
+
+    def _send(self, method, url, data=None, headers=None):
+        '''
+        Send a request to the REST API, update the statistics and get the
+        respond with its decoded content
+        '''
+        if headers is None:
+            headers = {}
+        headers['Accept-Encoding'] = 'gzip'
+        data, saved_sent, compress_time = self._compress(data, headers)
+        respond = requests.request(method, url, data=data, headers=headers,
+                                   stream=True)
+        # Read the bytes as they come in the wire to know the compressed size,
+        # timing only the transfer of the body and not the server latency
+        start = time.time()
+        content = respond.raw.read(decode_content=False)
+        transfer_time = time.time() - start
+        respond.close()
+
+        sent = 0
+        if isinstance(data, bytes):
+            sent = len(data)
+        received = len(content)
+        decompress_time = 0.0
+        if respond.headers.get('Content-Encoding', None) in ('gzip',
+                                                             'deflate'):
+            start = time.time()
+            content = zlib.decompress(content, 32 + zlib.MAX_WBITS)
+            decompress_time = time.time() - start
+        saved = saved_sent + max(len(content) - received, 0)
+
+        rate = self.bandwidth
+        if not rate and transfer_time > 0 and received:
+            rate = received / transfer_time
+
+        with self._lock:
+            self.statistics['requests'] += 1
+            self.statistics['bytesSent'] += sent
+            self.statistics['bytesReceived'] += received
+            self.statistics['bytesSaved'] += saved
+            if saved and rate:
+                self.statistics['timeSaved'] += float(saved) / rate
+            self.statistics['timeSaved'] -= compress_time + decompress_time
+        return respond, content
+
     def post(self, path, params='', data=None):
         '''
         POST Method Wrapper of the REST API
@@ -75,17 +161,19 @@ class _Request(object):
         if data is None:
             data = {}
         headers = {'Content-Type': 'application/json'}
-        respond = requests.post(
+        respond, content = self._send(
+            'POST',
             str(self.credential.config['url'] + path + '?access_token=' +
                 self.credential.get_token() + params),
             data=data,
             headers=headers)
         if not self.check_token(respond):
-            respond = requests.post(
+            respond, content = self._send(
+                'POST',
                 str(self.credential.config['url'] + path + '?access_token=' +
                     self.credential.get_token() + params),
                 data=data, headers=headers)
-        return respond.json()
+        return json.loads(content.decode('utf-8'))
 
     def get(self, path, params='', with_token=True):
         '''
@@ -99,12 +187,13 @@ class _Request(object):
                 access_token = ''
         else:
             access_token = ''
-        respond = requests.get(
-            self.credential.config['url'] + path + access_token + params)
+        respond, content = self._send(
+            'GET', self.credential.config['url'] + path + access_token + params)
         if not self.check_token(respond):
-            respond = requests.get(
+            respond, content = self._send(
+                'GET',
                 self.credential.config['url'] + path + access_token + params)
-        return respond.json()
+        return json.loads(content.decode('utf-8'))
 
 
 class IBMQuantumExperience(object):
@@ -160,6 +249,12 @@ class IBMQuantumExperience(object):
             return False
         return True
 
+    def check_credentials(self):
+        '''
+        Check if the token is valid in QX platform
+        '''
+        return self._check_credentials()
+
     def _beautify_calibration_parameters(self, cals, device):
         '''
         Beautify the calibrations returned by QX platform
@@ -473,6 +568,123 @@ class IBMQuantumExperience(object):
         job = self.req.get('/Jobs/' + id_job)
         return job
 
+    def get_statistics(self):
+        '''
+        Get the statistics of the requests done to QX Platform
+        '''
+        return dict(self.req.statistics)
+
+    def wait_job(self, id_job, timeout=60):
+        '''
+        Wait for a job to finish, checking its status every 2 seconds, and
+        get its information
+        '''
+        job = self.get_job(id_job)
+        for _ in range(1, timeout):
+            status = job.get('status', 'ERROR')
+            if status == 'COMPLETED' or 'ERROR' in status:
+                break
+            time.sleep(2)
+            job = self.get_job(id_job)
+        return job
+
+    def run_sweep(self, template, names, values, device='simulator', shots=1,
+                  max_credits=3, seed=None, batch_size=50, workers=4,
+                  timeout=60, resume=None):
+        '''
+        Execute a QASM template over a grid of parameter values
+        '''
+        if not self._check_credentials():
+            respond = {}
+            respond["error"] = "Not credentials valid"
+            return respond
+        if numpy is None:
+            respond = {}
+            respond["error"] = "NumPy is required to run a sweep"
+            return respond
+        values = numpy.asarray(values, dtype=float)
+        if values.ndim == 0 or values.shape[-1] != len(names):
+            respond = {}
+            respond["error"] = str("The last dimension of values must be " +
+                                   "the number of parameters: " +
+                                   str(len(names)))
+            return respond
+        grid_shape = values.shape[:-1]
+        points = values.reshape(-1, len(names))
+
+        if isinstance(resume, numpy.ndarray) and resume.dtype == object:
+            # Filled in place, so the caller keeps the progress if the sweep
+            # is interrupted
+            results = resume
+        elif resume is not None:
+            results = numpy.array(resume, dtype=object)
+        else:
+            results = numpy.empty(grid_shape, dtype=object)
+        if results.shape != grid_shape:
+            respond = {}
+            respond["error"] = "Resumed results do not match the grid"
+            return respond
+        if not len(points):
+            return results
+
+        template = Template(template)
+        try:
+            template.substitute(dict(zip(names, points[0])))
+        except (KeyError, ValueError) as ex:
+            respond = {}
+            respond["error"] = "Not valid template: " + str(ex)
+            return respond
+
+        pending = [index for index in range(len(points))
+                   if results.flat[index] is None]
+        batch_size = max(1, batch_size)
+        batches = [pending[i:i + batch_size]
+                   for i in range(0, len(pending), batch_size)]
+
+        def run_batch(batch):
+            qasms = []
+            for index in batch:
+                params = {}
+                for name, value in zip(names, points[index]):
+                    params[name] = repr(float(value))
+                qasms.append({'qasm': template.substitute(params)})
+            try:
+                job = self.run_job(qasms, device, shots, max_credits, seed)
+                if 'id' in job:
+                    job = self.wait_job(job['id'], timeout)
+            except Exception as ex:
+                # The points of this batch stay without result to resume them
+                job = {"error": str(ex)}
+            return batch, job
+
+        pool = ThreadPool(max(1, min(workers, len(batches))))
+        try:
+            for batch, job in pool.imap_unordered(run_batch, batches):
+                if job.get('status', None) == 'COMPLETED':
+                    for index, qasm in zip(batch, job.get('qasms', [])):
+                        data = qasm.get('result', {}).get('data', {})
+                        if 'counts' in data:
+                            results.flat[index] = data['counts']
+                missing = [index for index in batch
+                           if results.flat[index] is None]
+                if missing:
+                    error = job.get('error', job.get('status', None))
+                    if error == 'COMPLETED':
+                        error = 'Not counts returned in the job'
+                    warnings.warn(str(
+                        "Not result for " + str(len(missing)) +
+                        " points of the sweep (job " +
+                        str(job.get('id', None)) + "): " + str(error)))
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
+
+        return results
+
     def device_status(self, device='ibmqx2'):
         '''
         Get the status of a chip
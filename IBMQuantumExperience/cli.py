@@ -0,0 +1,227 @@
+'''
+    Command line runner of QASM files in IBM Quantum Experience
+'''
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import sys
+import time
+from multiprocessing.pool import ThreadPool
+from IBMQuantumExperience.IBMQuantumExperience import IBMQuantumExperience
+
+_SUCCESS_STATUS = ['DONE', 'COMPLETED']
+
+
+def _find_circuits(paths):
+    '''
+    Get the names of the circuits to run, expanding the directories
+    '''
+    circuits = []
+    for path in paths:
+        if path == '-':
+            circuits.append('-')
+        elif os.path.isdir(path):
+            for root, _, files in sorted(os.walk(path)):
+                for name in sorted(files):
+                    if name.endswith('.qasm'):
+                        circuits.append(os.path.join(root, name))
+        else:
+            circuits.append(path)
+    return circuits
+
+
+def _read_circuit(name, stdin_qasm):
+    '''
+    Get the QASM of a circuit, by its file name
+    '''
+    if name == '-':
+        return stdin_qasm
+    with open(name) as qasm_file:
+        return qasm_file.read()
+
+
+def _checkpoint_key(name, stdin_qasm):
+    '''
+    Get the name of a circuit in the checkpoint. The QASM read from stdin is
+    recorded by its hash, because it can change between runs
+    '''
+    if name == '-':
+        return '-:' + hashlib.sha256(stdin_qasm.encode('utf-8')).hexdigest()
+    return name
+
+
+def _read_checkpoint(path):
+    '''
+    Get the names of the circuits already completed in a previous run
+    '''
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path) as checkpoint:
+        return set(line.rstrip('\n') for line in checkpoint if line.strip())
+
+
+def _run_batch(api, batch, args, stdin_qasm):
+    '''
+    Execute a batch of circuits in one job and get a record by circuit
+    '''
+    records = []
+    qasms = []
+    names = []
+    for name in batch:
+        try:
+            qasms.append({'qasm': _read_circuit(name, stdin_qasm)})
+            names.append(name)
+        except (IOError, OSError) as ex:
+            records.append({'file': name, 'error': str(ex)})
+    if not qasms:
+        return records
+
+    try:
+        job = api.run_job(qasms, args.device, args.shots, args.max_credits,
+                          args.seed)
+        if 'id' in job:
+            job = api.wait_job(job['id'], args.timeout)
+    except Exception as ex:
+        job = {'error': str(ex)}
+    if job.get('status', None) != 'COMPLETED':
+        for name in names:
+            records.append({'file': name, 'idJob': job.get('id', None),
+                            'error': job.get('error', job.get('status'))})
+        return records
+
+    results = job.get('qasms', [])
+    for index, name in enumerate(names):
+        record = {'file': name, 'idJob': job['id']}
+        if index >= len(results):
+            record['error'] = 'Not result returned in the job'
+        else:
+            record['status'] = results[index].get('status', job['status'])
+            record['result'] = results[index].get('result', None)
+            if record['status'] not in _SUCCESS_STATUS:
+                record['error'] = record['status']
+        records.append(record)
+    return records
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog='qx-run',
+        description='Run QASM files in IBM Quantum Experience and write ' +
+        'each result to stdout as one JSON line.')
+    parser.add_argument('paths', nargs='*',
+                        help='QASM files or directories with .qasm files. ' +
+                        'Use - to read one QASM from stdin. Without paths, ' +
+                        'the file names are read from stdin, one by line.')
+    parser.add_argument('--token', default=os.environ.get('QX_API_TOKEN'),
+                        help='API token (default: $QX_API_TOKEN)')
+    parser.add_argument('--url', default=None,
+                        help='URL of the API')
+    parser.add_argument('--device', default='simulator')
+    parser.add_argument('--shots', type=int, default=1)
+    parser.add_argument('--max-credits', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=50,
+                        help='circuits sent in each job')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='jobs running at the same time')
+    parser.add_argument('--timeout', type=int, default=60,
+                        help='time to wait for each job, like run_experiment')
+    parser.add_argument('--checkpoint', default=None,
+                        help='file to record the completed circuits, ' +
+                        'used to skip them when the run is resumed')
+    parser.add_argument('--quiet', action='store_true',
+                        help='do not write the progress to stderr')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    '''
+    Entry point of the qx-run command
+    '''
+    args = _parse_args(argv)
+    if not args.token:
+        sys.stderr.write('ERROR: Not token given. Use --token or ' +
+                         'QX_API_TOKEN\n')
+        return 2
+
+    stdin_qasm = None
+    paths = args.paths
+    if not paths:
+        paths = [line.strip() for line in sys.stdin if line.strip()]
+    elif '-' in paths:
+        stdin_qasm = sys.stdin.read()
+
+    done = _read_checkpoint(args.checkpoint)
+    circuits = _find_circuits(paths)
+    skipped = len(circuits)
+    circuits = [name for name in circuits
+                if _checkpoint_key(name, stdin_qasm) not in done]
+    skipped -= len(circuits)
+    batch_size = max(1, args.batch_size)
+    batches = [circuits[i:i + batch_size]
+               for i in range(0, len(circuits), batch_size)]
+
+    config = None
+    if args.url:
+        config = {'url': args.url}
+    # The login messages must not be mixed with the JSON lines of stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        api = IBMQuantumExperience(args.token, config)
+    if not api.check_credentials():
+        sys.stderr.write('ERROR: Not token valid\n')
+        return 2
+
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = open(args.checkpoint, 'a')
+
+    completed = 0
+    failed = 0
+    start = time.time()
+    pool = ThreadPool(max(1, min(args.concurrency, len(batches))))
+    try:
+        for records in pool.imap_unordered(
+                lambda batch: _run_batch(api, batch, args, stdin_qasm),
+                batches):
+            for record in records:
+                sys.stdout.write(json.dumps(record) + '\n')
+                if 'error' in record:
+                    failed += 1
+                else:
+                    completed += 1
+                    if checkpoint:
+                        checkpoint.write(
+                            _checkpoint_key(record['file'], stdin_qasm) + '\n')
+            sys.stdout.flush()
+            if checkpoint:
+                checkpoint.flush()
+            if not args.quiet:
+                elapsed = time.time() - start
+                sys.stderr.write('%d/%d circuits, %d failed, %.2f circuits/s\n'
+                                 % (completed + failed, len(circuits), failed,
+                                    (completed + failed) / max(elapsed, 1e-6)))
+    except BaseException:
+        # Do not submit the batches still queued, they are not checkpointed
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+        if checkpoint:
+            checkpoint.close()
+
+    if not args.quiet:
+        elapsed = time.time() - start
+        sys.stderr.write('Completed %d circuits (%d failed, %d skipped by ' %
+                         (completed, failed, skipped) +
+                         'checkpoint) in %.1fs\n' % elapsed)
+    if failed:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,4 +12,12 @@ setup(name = 'IBMQuantumExperience',
       install_requires=[
         'requests'
       ],
+      extras_require={
+        'sweep': ['numpy']
+      },
+      entry_points={
+        'console_scripts': [
+          'qx-run = IBMQuantumExperience.cli:main'
+        ]
+      },
       zip_safe=False)
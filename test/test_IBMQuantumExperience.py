@@ -1,6 +1,8 @@
 import sys
 sys.path.append('../IBMQuantumExperience')
 from IBMQuantumExperience import IBMQuantumExperience
+import os
+import tempfile
 import unittest
 from config import *
 
@@ -93,6 +95,45 @@ class TestQX(unittest.TestCase):
         job = api.run_job(qasms, device, shots)
         self.assertIsNotNone(job['error'])
 
+    def test_api_run_sweep(self):
+        '''
+        Check run a sweep of a template by user authenticated
+        '''
+        api = IBMQuantumExperience(API_TOKEN)
+        template = "IBMQASM 2.0;\n\ninclude \"qelib1.inc\";\nqreg q[5];\ncreg c[5];\nu3($theta,0,0) q[0];\nmeasure q -> c;\n"
+        values = [[0.0], [1.5707963267948966], [3.141592653589793]]
+        device = 'simulator'
+        shots = 1
+        results = api.run_sweep(template, ['theta'], values, device, shots,
+                                batch_size=2)
+        self.assertEqual(results.shape, (3,))
+
+    def test_api_run_sweep_fail_template(self):
+        '''
+        Check run a sweep is not runned because a parameter of the template is not defined
+        '''
+        api = IBMQuantumExperience(API_TOKEN)
+        template = "IBMQASM 2.0;\n\ninclude \"qelib1.inc\";\nqreg q[5];\ncreg c[5];\nu3($theta,$phi,0) q[0];\nmeasure q -> c;\n"
+        values = [[0.0], [3.141592653589793]]
+        results = api.run_sweep(template, ['theta'], values)
+        self.assertIsNotNone(results['error'])
+
+    def test_cli_run_files(self):
+        '''
+        Check run QASM files with the command line by user authenticated
+        '''
+        from IBMQuantumExperience.cli import main
+        directory = tempfile.mkdtemp()
+        for index in range(3):
+            with open(os.path.join(directory, str(index) + '.qasm'), 'w') as qasm:
+                qasm.write("IBMQASM 2.0;\n\ninclude \"qelib1.inc\";\nqreg q[5];\ncreg c[5];\nx q[0];\nmeasure q -> c;\n")
+        checkpoint = os.path.join(directory, 'run.ckpt')
+        args = ['--token', API_TOKEN, '--batch-size', '2', '--quiet',
+                '--checkpoint', checkpoint, directory]
+        self.assertEqual(main(args), 0)
+        with open(checkpoint) as completed:
+            self.assertEqual(len(completed.readlines()), 3)
+
     def test_api_device_status(self):
         '''
         Check the status of a real chip
@@ -0,0 +1,158 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import mock
+from IBMQuantumExperience.cli import main
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, body):
+        body = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.startswith('/users/loginWithToken'):
+            if self.server.valid_token:
+                self._respond({'id': 'token', 'userId': 'user'})
+            else:
+                self._respond({'error': 'invalid token'})
+            return
+        data = json.loads(body.decode('utf-8'))
+        qasms = []
+        for qasm in data['qasms']:
+            if 'fail' in qasm['qasm']:
+                qasms.append({'status': 'ERROR_RUNNING_JOB'})
+            else:
+                qasms.append({'status': 'DONE',
+                              'result': {'data': {'counts': {'00001': 1}}}})
+        id_job = 'job' + str(len(self.server.jobs))
+        self.server.jobs[id_job] = {'id': id_job, 'status': 'COMPLETED',
+                                    'qasms': qasms}
+        self._respond({'id': id_job, 'status': 'RUNNING'})
+
+    def do_GET(self):
+        id_job = self.path.split('?')[0].split('/')[-1]
+        self._respond(self.server.jobs[id_job])
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.jobs = {}
+        self.server.valid_token = True
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+        self.directory = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.directory, 'run.ckpt')
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, qasm="IBMQASM 2.0;\nqreg q[5];\ncreg c[5];\nx q[0];\nmeasure q -> c;\n"):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as qasm_file:
+            qasm_file.write(qasm)
+        return path
+
+    def _run(self, paths, stdin=''):
+        args = ['--token', 'token', '--url', self.url, '--batch-size', '2',
+                '--quiet', '--checkpoint', self.checkpoint] + paths
+        with mock.patch('sys.stdout', new_callable=io.StringIO) as stdout, \
+                mock.patch('sys.stdin', io.StringIO(stdin)):
+            status = main(args)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return status, records
+
+    def test_run_and_resume(self):
+        '''
+        Check the results are written as JSON lines and a second run does not
+        submit the circuits in the checkpoint
+        '''
+        for index in range(5):
+            self._write(str(index) + '.qasm')
+        status, records = self._run([self.directory])
+        self.assertEqual(status, 0)
+        self.assertEqual(len(records), 5)
+        self.assertEqual(len(self.server.jobs), 3)
+        for record in records:
+            self.assertTrue(record['file'].endswith('.qasm'))
+            self.assertIn(record['idJob'], self.server.jobs)
+            self.assertEqual(record['result']['data']['counts'], {'00001': 1})
+
+        status, records = self._run([self.directory])
+        self.assertEqual(status, 0)
+        self.assertEqual(records, [])
+        self.assertEqual(len(self.server.jobs), 3)
+
+    def test_failed_circuit_is_resubmitted(self):
+        '''
+        Check a circuit with error in its job is not checkpointed
+        '''
+        self._write('ok.qasm')
+        failing = self._write('fail.qasm', 'fail')
+        status, records = self._run([self.directory])
+        self.assertEqual(status, 1)
+        errors = [record['file'] for record in records if 'error' in record]
+        self.assertEqual(errors, [failing])
+
+        status, records = self._run([self.directory])
+        self.assertEqual(status, 1)
+        self.assertEqual([record['file'] for record in records], [failing])
+
+    def test_paths_from_stdin(self):
+        '''
+        Check the file names are read from stdin without paths
+        '''
+        paths = [self._write('a.qasm'), self._write('b.qasm')]
+        status, records = self._run([], stdin='\n'.join(paths) + '\n')
+        self.assertEqual(status, 0)
+        self.assertEqual(sorted(record['file'] for record in records), paths)
+
+    def test_qasm_from_stdin(self):
+        '''
+        Check one QASM is read from stdin with - and it is checkpointed by
+        its content
+        '''
+        status, records = self._run(['-'], stdin='x q[0];\n')
+        self.assertEqual(status, 0)
+        self.assertEqual(records[0]['file'], '-')
+
+        status, records = self._run(['-'], stdin='x q[0];\n')
+        self.assertEqual(records, [])
+        status, records = self._run(['-'], stdin='x q[1];\n')
+        self.assertEqual(len(records), 1)
+        self.assertEqual(len(self.server.jobs), 2)
+
+    def test_invalid_token(self):
+        '''
+        Check an invalid token is reported in stderr
+        '''
+        self.server.valid_token = False
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            status, records = self._run([self._write('a.qasm')])
+        self.assertEqual(status, 2)
+        self.assertEqual(records, [])
+        self.assertIn('Not token valid', stderr.getvalue())
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCli)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,169 @@
+import gzip
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from IBMQuantumExperience.IBMQuantumExperience import IBMQuantumExperience
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, body, compress=False):
+        body = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzip.compress(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.startswith('/users/loginWithToken'):
+            self._respond({'id': 'token', 'userId': 'user'})
+            return
+        encoding = self.headers.get('Content-Encoding', None)
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        self.server.encodings.append(encoding)
+        data = json.loads(body.decode('utf-8'))
+        self._respond({'id': 'job', 'status': 'RUNNING',
+                       'qasms': len(data['qasms'])})
+
+    def do_GET(self):
+        qasms = [{'result': {'data': {'counts': {'00000': 1}}}}] * 500
+        body = {'id': 'job', 'status': 'COMPLETED', 'qasms': qasms}
+        if self.path.startswith('/Jobs/slow'):
+            time.sleep(1)
+        if self.path.startswith('/Jobs/chunked'):
+            self._respond_chunked(body)
+        else:
+            self._respond(body, compress=True)
+
+    def _respond_chunked(self, body):
+        body = gzip.compress(json.dumps(body).encode('utf-8'))
+        self.server.wire_sizes.append(len(body))
+        self.protocol_version = 'HTTP/1.1'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for start in range(0, len(body), 16):
+            chunk = body[start:start + 16]
+            self.wfile.write(('%x\r\n' % len(chunk)).encode('ascii') +
+                             chunk + b'\r\n')
+        self.wfile.write(b'0\r\n\r\n')
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.encodings = []
+        self.server.wire_sizes = []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _qasms(self, number):
+        qasm = "IBMQASM 2.0;\n\ninclude \"qelib1.inc\";\nqreg q[5];\ncreg c[5];\nx q[0];\nmeasure q -> c;\n"
+        return [{'qasm': qasm} for _ in range(number)]
+
+    def test_run_job_gzip_request(self):
+        '''
+        Check the body of a big job is sent compressed with gzip
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url,
+                                             'gzip_threshold': 1024})
+        job = api.run_job(self._qasms(100))
+        self.assertEqual(job['qasms'], 100)
+        self.assertEqual(self.server.encodings, ['gzip'])
+        statistics = api.get_statistics()
+        self.assertGreater(statistics['bytesSaved'], 0)
+        self.assertLess(statistics['bytesSent'], 1024)
+
+    def test_run_job_small_request(self):
+        '''
+        Check the body of a job smaller than the threshold is not compressed
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url,
+                                             'gzip_threshold': 1024})
+        api.run_job(self._qasms(1))
+        self.assertEqual(self.server.encodings, [None])
+        self.assertEqual(api.get_statistics()['bytesSaved'], 0)
+
+    def test_run_job_without_gzip(self):
+        '''
+        Check the body of a job is not compressed without gzip_threshold
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url})
+        api.run_job(self._qasms(100))
+        self.assertEqual(self.server.encodings, [None])
+        statistics = api.get_statistics()
+        self.assertGreater(statistics['bytesSent'], 5000)
+        self.assertEqual(statistics['bytesSaved'], 0)
+
+    def test_get_job_gzip_response(self):
+        '''
+        Check the compressed result of a job is decoded and counted
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url})
+        job = api.get_job('job')
+        self.assertEqual(len(job['qasms']), 500)
+        statistics = api.get_statistics()
+        self.assertEqual(statistics['requests'], 1)
+        self.assertGreater(statistics['bytesSaved'], 0)
+
+    def test_get_job_chunked_gzip_response(self):
+        '''
+        Check the bytes of a chunked compressed result are counted as they
+        come in the wire
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url})
+        job = api.get_job('chunked')
+        self.assertEqual(len(job['qasms']), 500)
+        statistics = api.get_statistics()
+        self.assertEqual(statistics['bytesReceived'],
+                         self.server.wire_sizes[0])
+        self.assertGreater(statistics['bytesSaved'], 0)
+
+    def test_time_saved_is_not_latency(self):
+        '''
+        Check the time saved does not count the latency of the server
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url})
+        start = time.time()
+        api.get_job('slow')
+        elapsed = time.time() - start
+        statistics = api.get_statistics()
+        self.assertGreater(statistics['bytesSaved'], 0)
+        self.assertLessEqual(statistics['timeSaved'], elapsed)
+
+    def test_time_saved_with_bandwidth(self):
+        '''
+        Check the time saved is estimated with the bandwidth of the config
+        '''
+        api = IBMQuantumExperience('token', {'url': self.url,
+                                             'gzip_threshold': 1024,
+                                             'bandwidth': 1000})
+        api.run_job(self._qasms(100))
+        statistics = api.get_statistics()
+        self.assertAlmostEqual(statistics['timeSaved'],
+                               statistics['bytesSaved'] / 1000.0, places=1)
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestCompression)
+    unittest.TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,124 @@
+import json
+import threading
+import unittest
+import warnings
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import numpy
+from IBMQuantumExperience.IBMQuantumExperience import IBMQuantumExperience
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, body):
+        body = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.path.startswith('/users/loginWithToken'):
+            self._respond({'id': 'token', 'userId': 'user'})
+            return
+        data = json.loads(body.decode('utf-8'))
+        self.server.posts.append(len(data['qasms']))
+        if any(self.server.reject in qasm['qasm'] for qasm in data['qasms']):
+            self._respond({'error': 'rejected'})
+            return
+        id_job = 'job' + str(len(self.server.jobs))
+        qasms = [{'status': 'DONE',
+                  'result': {'data': {'counts': {qasm['qasm']: 1}}}}
+                 for qasm in data['qasms']]
+        self.server.jobs[id_job] = {'id': id_job, 'status': 'COMPLETED',
+                                    'qasms': qasms}
+        self._respond({'id': id_job, 'status': 'RUNNING'})
+
+    def do_GET(self):
+        id_job = self.path.split('?')[0].split('/')[-1]
+        self._respond(self.server.jobs[id_job])
+
+
+class TestSweep(unittest.TestCase):
+
+    template = "u3($theta,$phi,0) q[0];"
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.jobs = {}
+        self.server.posts = []
+        self.server.reject = 'u3(1.0,0.0,0)'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.api = IBMQuantumExperience(
+            'token', {'url': 'http://127.0.0.1:%d' % self.server.server_port})
+        self.values = numpy.stack(numpy.meshgrid([0.0, 1.0], [0.0, 1.0, 2.0],
+                                                 indexing='ij'), -1)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _check_point(self, results, i, j):
+        qasm = 'u3(%r,%r,0) q[0];' % tuple(float(value)
+                                           for value in self.values[i, j])
+        self.assertEqual(results[i, j], {qasm: 1})
+
+    def test_sweep_failed_batch_and_resume(self):
+        '''
+        Check the results are aligned with the grid, a failed batch leaves
+        its points without result and resume only runs those points
+        '''
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            results = self.api.run_sweep(self.template, ['theta', 'phi'],
+                                         self.values, batch_size=2,
+                                         workers=2)
+        self.assertEqual(results.shape, (2, 3))
+        self.assertEqual(sorted(self.server.posts), [2, 2, 2])
+        self.assertIsNone(results[0, 2])
+        self.assertIsNone(results[1, 0])
+        for i, j in [(0, 0), (0, 1), (1, 1), (1, 2)]:
+            self._check_point(results, i, j)
+        self.assertEqual(len(caught), 1)
+        self.assertIn('rejected', str(caught[0].message))
+
+        self.server.reject = 'not rejected'
+        results = self.api.run_sweep(self.template, ['theta', 'phi'],
+                                     self.values, batch_size=2,
+                                     resume=results)
+        self.assertEqual(sorted(self.server.posts), [2, 2, 2, 2])
+        for i in range(2):
+            for j in range(3):
+                self._check_point(results, i, j)
+
+    def test_sweep_resume_in_place(self):
+        '''
+        Check the array given in resume is filled in place
+        '''
+        self.server.reject = 'not rejected'
+        results = numpy.empty((2, 3), dtype=object)
+        returned = self.api.run_sweep(self.template, ['theta', 'phi'],
+                                      self.values, batch_size=4,
+                                      resume=results)
+        self.assertIs(returned, results)
+        self.assertEqual(sorted(self.server.posts), [2, 4])
+        self._check_point(results, 1, 2)
+
+    def test_sweep_empty_grid(self):
+        '''
+        Check an empty grid does not run any job
+        '''
+        results = self.api.run_sweep(self.template, ['theta', 'phi'],
+                                     numpy.zeros((0, 2)))
+        self.assertEqual(results.shape, (0,))
+        self.assertEqual(self.server.posts, [])
+
+if __name__ == '__main__':
+    suite = unittest.TestLoader().loadTestsFromTestCase(TestSweep)
+    unittest.TextTestRunner(verbosity=2).run(suite)